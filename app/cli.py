@@ -15,45 +15,98 @@ Run this module directly or use its commands via `python -m app.cli ...`.
 
 # app/cli.py
 import logging
+import os
+from typing import Optional
 import typer
 import uvicorn
-from sentence_transformers import SentenceTransformer
 
 # Local Imports
-from app.main import app  # Import the FastAPI app object
+# Heavy modules (torch, sentence-transformers, ChromaDB, the web app) are imported inside
+# each command, so `--help` stays instant and parsing workers don't re-import them.
 from app.config import get_settings
-from app.data_builder import DatabaseBuilder
 
 # Setup CLI
 cli = typer.Typer(help="A professional RAG application CLI.")
 
+# Each worker loads its own embedding model, so CPU hosts are capped rather than using every core
+MAX_DEFAULT_CPU_WORKERS = 8
+
+def _default_workers(settings) -> int:
+    """
+    Returns the default number of server workers. A single worker unless REDIS_URL is set, since
+    otherwise every worker enforces its own rate limit. With Redis: one per CPU core (capped) for
+    CPU inference, but still one on GPU, since every worker would hold another model copy in VRAM.
+    """
+    if not settings.REDIS_URL:
+        return 1
+    device = settings.EMBEDDING_DEVICE
+    if device is None:
+        import torch
+        accelerated = torch.cuda.is_available() or torch.backends.mps.is_available()
+    else:
+        accelerated = device != "cpu"
+    return 1 if accelerated else min(os.cpu_count() or 1, MAX_DEFAULT_CPU_WORKERS)
+
 @cli.command()
-def build_db():
+def build_db(
+    bulk_load: bool = typer.Option(
+        False, "--bulk-load/--safe-load",
+        help=(
+            "Disable SQLite journaling and fsync while building; if the build crashes, re-run it. "
+            "Only takes effect on Chroma backends that write through Python SQLite (before 1.0); "
+            "ignored with a warning otherwise."
+        ),
+    ),
+):
     """
     Build Vector Database
     --------------------
     Processes all source JSON files, generates embeddings, and builds the ChromaDB vector store.
     Ensures deduplication, chunking, and robust error handling for production use.
     """
+    from app.data_builder import DatabaseBuilder
+    from app.models import get_embedder
+
     typer.secho("Building vector database...", fg=typer.colors.CYAN)
-    settings = get_settings()
-    model = SentenceTransformer(settings.EMBEDDING_MODEL_NAME)
+    settings = get_settings().model_copy(update={"BULK_LOAD": bulk_load})
+    model = get_embedder()
+    typer.secho(f"   Using embedding device: {model.device}", fg=typer.colors.BLUE)
     builder = DatabaseBuilder(settings, model)
     num_chunks, num_questions = builder.run()
     if num_chunks > 0:
         typer.secho(f"✅ Success! Built DB '{settings.COLLECTION_NAME}' with {num_chunks} chunks from {num_questions} unique questions.", fg=typer.colors.GREEN)
 
 @cli.command()
-def run_app(host: str = "0.0.0.0", port: int = 8000):
+def run_app(
+    host: str = "0.0.0.0",
+    port: int = 8000,
+    workers: Optional[int] = typer.Option(
+        None,
+        help=(
+            "Number of server processes. Defaults to 1; with REDIS_URL set, one per CPU core (max 8) on CPU. "
+            "Each worker loads its own embedding model, and without REDIS_URL each enforces its own rate limit."
+        ),
+    ),
+):
     """
     Start FastAPI Server
     -------------------
     Launches the Uvicorn server to serve the RAG API, making the system accessible via HTTP.
+    Runs several worker processes on CPU hosts when rate limits are shared through REDIS_URL,
+    since each worker's inference is single-threaded. Trade-off: memory grows with the worker
+    count (one model copy each), and rate limits are per worker unless REDIS_URL is set.
     Provides clear startup feedback and API documentation URL.
     """
-    typer.secho(f"🚀 Starting RAG server at http://{host}:{port}", fg=typer.colors.BRIGHT_BLUE)
-    typer.secho("   Access API docs at http://{host}:{port}/docs", fg=typer.colors.BLUE)
-    uvicorn.run(app, host=host, port=port)
+    settings = get_settings()
+    if workers is None:
+        workers = _default_workers(settings)
+    if workers > 1 and not settings.REDIS_URL:
+        typer.secho(f"   Note: without REDIS_URL, each of the {workers} workers enforces its own rate limit.", fg=typer.colors.YELLOW)
+    typer.secho(f"🚀 Starting RAG server at http://{host}:{port} with {workers} worker(s)", fg=typer.colors.BRIGHT_BLUE)
+    typer.secho(f"   Access API docs at http://{host}:{port}/docs", fg=typer.colors.BLUE)
+    # An import string lets Uvicorn load the app independently in each worker process;
+    # "auto" picks uvloop and httptools when installed (uvicorn[standard]).
+    uvicorn.run("app.main:app", host=host, port=port, workers=workers, loop="auto", http="auto")
 
 # This check allows the file to be run directly
 if __name__ == "__main__":
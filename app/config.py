@@ -15,6 +15,8 @@ Import `get_settings()` wherever configuration is needed.
 
 import logging
 from functools import lru_cache
+from typing import Optional
+from pydantic import Field
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -27,13 +29,17 @@ class Settings(BaseSettings):
     GEMINI_API_KEY: str
     GEMINI_MODEL_NAME: str = 'gemini-1.5-flash-latest'
     EMBEDDING_MODEL_NAME: str = 'all-MiniLM-L6-v2'
+    EMBEDDING_DEVICE: Optional[str] = None  # e.g. "cuda" or "cpu"; auto-detected when unset
     DATA_DIR: str = "data"
     CHROMA_PERSIST_DIR: str = "chroma_db_store"
     COLLECTION_NAME: str = "islamqa_collection_v1"
     N_RESULTS_RETRIEVAL: int = 5
     CHUNK_SIZE_WORDS: int = 300
-    RATE_LIMIT_REQUESTS: int = 20
-    RATE_LIMIT_TIMEFRAME_SECONDS: int = 60
+    BULK_LOAD: bool = False  # Unsafe, fast SQLite settings while building the DB; `build-db --bulk-load`
+    # Must be positive: the token bucket refills at RATE_LIMIT_REQUESTS per RATE_LIMIT_TIMEFRAME_SECONDS
+    RATE_LIMIT_REQUESTS: int = Field(20, gt=0)
+    RATE_LIMIT_TIMEFRAME_SECONDS: int = Field(60, gt=0)
+    REDIS_URL: Optional[str] = None  # Shares rate limits across workers when set
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
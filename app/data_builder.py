@@ -16,11 +16,34 @@ Instantiate `DatabaseBuilder` and call `run()` to build or rebuild the vector da
 
 # app/data_builder.py
 import os
-import json
+import asyncio
 import logging
+import multiprocessing
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 import chromadb
+from tqdm.auto import tqdm
 from sentence_transformers import SentenceTransformer
 from app.config import Settings
+from app.parsing import parse_file
+
+# Encoding mini-batch sizes; GPUs amortize far larger batches than CPUs
+CPU_ENCODE_BATCH_SIZE = 64
+GPU_ENCODE_BATCH_SIZE = 256
+# Used when the Chroma client cannot report its own per-call insert limit
+DEFAULT_MAX_ADD_BATCH_SIZE = 5000
+# Chunks encoded per pipeline step, and how many encoded steps may await writing
+PIPELINE_BATCH_SIZE = 5000
+PIPELINE_QUEUE_SIZE = 2
+# Build-only SQLite settings: no rollback journal, no fsync, temp tables in RAM.
+# A crash mid-build can corrupt the store, which is then rebuilt by re-running `build-db`.
+BULK_LOAD_PRAGMAS = (
+    "PRAGMA journal_mode = OFF",
+    "PRAGMA synchronous = OFF",
+    "PRAGMA temp_store = MEMORY",
+)
 
 class DatabaseBuilder:
     """
@@ -39,6 +62,9 @@ class DatabaseBuilder:
         self.settings = settings
         self.embedding_model = model
         self.client = chromadb.PersistentClient(path=settings.CHROMA_PERSIST_DIR)
+        # Chroma pools one SQLite connection per thread, so pragmas are applied per writing thread
+        self._bulk_load_db = self._find_sqlite_db() if settings.BULK_LOAD else None
+        self._bulk_load_threads = set()
 
     def run(self) -> tuple[int, int]:
         """
@@ -68,50 +94,211 @@ class DatabaseBuilder:
         -------------------
         Iterates through all JSON files, extracts and chunks Q&A pairs, and deduplicates questions.
         Returns:
-            tuple: (chunks, metadatas, seen_questions)
+            tuple: (chunks, metadatas, seen_questions), where seen_questions holds question digests
         """
         chunks, metadatas, seen_questions = [], [], set()
-        for file_name in json_files:
-            file_path = os.path.join(self.settings.DATA_DIR, file_name)
+        for file_name, outcome in self._parse_files(json_files):
             logging.info(f"--> Processing file: {file_name}")
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                for category_data in data.values():
-                    for qna_item in category_data.get('questions', []):
-                        q, a, url = qna_item.get('question'), qna_item.get('answer'), qna_item.get('url')
-                        if q and a and q.strip().lower() not in seen_questions:
-                            seen_questions.add(q.strip().lower())
-                            words = a.strip().split()
-                            for i in range(0, len(words), self.settings.CHUNK_SIZE_WORDS):
-                                chunk_text = " ".join(words[i:i+self.settings.CHUNK_SIZE_WORDS])
-                                document = f"Question: {q.strip()}\nAnswer: {chunk_text}"
-                                chunks.append(document)
-                                metadatas.append({'source': url or file_name})
-            except Exception as e:
-                logging.warning(f"Skipping file {file_name} due to error: {e}")
+            if isinstance(outcome, Exception):
+                logging.warning(f"Skipping file {file_name} due to error: {outcome}")
+                continue
+            # Files are merged in input order, so the first file to contain a question keeps it
+            for key, documents, source in outcome:
+                if key in seen_questions:
+                    continue
+                seen_questions.add(key)
+                chunks.extend(documents)
+                metadatas.extend({'source': source} for _ in documents)
         return chunks, metadatas, seen_questions
 
+    def _parse_files(self, json_files: list):
+        """
+        Parse Source Files in Parallel
+        ------------------------------
+        Parses each file in a worker process and yields results in input order.
+        A single file is parsed inline to skip the process pool start-up cost.
+        Yields:
+            tuple: (file_name, records or the exception raised while parsing the file)
+        """
+        chunk_size = self.settings.CHUNK_SIZE_WORDS
+        paths = [os.path.join(self.settings.DATA_DIR, file_name) for file_name in json_files]
+        max_workers = min(len(json_files), os.cpu_count() or 1)
+        if max_workers <= 1:
+            for file_name, file_path in zip(json_files, paths):
+                try:
+                    yield file_name, parse_file(file_path, file_name, chunk_size)
+                except Exception as e:
+                    yield file_name, e
+            return
+
+        # forkserver (spawn where unavailable, e.g. Windows) starts workers without fork()-copying
+        # this process's torch/CUDA state. Each worker still re-imports `__main__` and
+        # `app.parsing`, which is why both are kept free of heavy imports.
+        start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context(start_method)) as executor:
+            futures = [
+                executor.submit(parse_file, file_path, file_name, chunk_size)
+                for file_name, file_path in zip(json_files, paths)
+            ]
+            for file_name, future in zip(json_files, futures):
+                try:
+                    yield file_name, future.result()
+                except Exception as e:
+                    yield file_name, e
+
     def _create_collection(self, chunks, metadatas):
         """
         Create or Rebuild ChromaDB Collection
         -------------------------------------
         Deletes any existing collection with the same name, then creates and populates a new one.
+        Encoding and writing are pipelined: a writer thread inserts each batch while the next
+        one is being encoded, with at most `PIPELINE_QUEUE_SIZE` encoded batches in flight.
+        Args:
+            chunks (list): List of document chunks.
+            metadatas (list): List of metadata dicts for each chunk.
+        """
+        collection = self._reset_collection()
+        logging.info(f"Embedding {len(chunks)} chunks...")
+
+        pending = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+        errors = []
+
+        def write_batches():
+            # Keep draining after a failure so the producer never blocks on a full queue
+            while (batch := pending.get()) is not None:
+                if errors:
+                    continue
+                try:
+                    self._add_batch(collection, batch)
+                except Exception as e:
+                    errors.append(e)
+
+        writer = threading.Thread(target=write_batches, name="chroma-writer", daemon=True)
+        writer.start()
+        try:
+            # One bar for the whole build, advanced as each encoded batch is queued for writing
+            with tqdm(total=len(chunks), desc="Embedding", unit="chunk") as progress:
+                for batch in self._iter_encoded_batches(chunks, metadatas):
+                    if errors:
+                        break
+                    pending.put(batch)
+                    progress.update(len(batch["ids"]))
+        finally:
+            pending.put(None)
+            writer.join()
+        if errors:
+            raise errors[0]
+
+    async def a_create_collection(self, chunks, metadatas):
+        """
+        Create or Rebuild ChromaDB Collection (Async)
+        ---------------------------------------------
+        Async counterpart of `_create_collection` for callers running inside an event loop.
+        Embedding and each blocking Chroma write run in a worker thread, so the loop stays responsive.
         Args:
             chunks (list): List of document chunks.
             metadatas (list): List of metadata dicts for each chunk.
         """
+        collection = await asyncio.to_thread(self._reset_collection)
+        logging.info(f"Embedding {len(chunks)} chunks...")
+        batches = self._iter_encoded_batches(chunks, metadatas)
+        with tqdm(total=len(chunks), desc="Embedding", unit="chunk") as progress:
+            while (batch := await asyncio.to_thread(next, batches, None)) is not None:
+                await asyncio.to_thread(self._add_batch, collection, batch)
+                progress.update(len(batch["ids"]))
+
+    def _add_batch(self, collection: chromadb.Collection, batch: dict):
+        """
+        Writes one batch to the collection, first applying bulk-load pragmas to this thread's connection if enabled.
+        """
+        if self._bulk_load_db is not None and threading.get_ident() not in self._bulk_load_threads:
+            self._bulk_load_threads.add(threading.get_ident())
+            self._apply_bulk_load_pragmas()
+        collection.add(**batch)
+
+    def _find_sqlite_db(self):
+        """
+        Returns the client's already-running Python SQLite component, or None if it has none.
+        Only looks the component up: `System.instance()` would construct and start a new one,
+        running migrations on a connection the actual writer never uses. Backends that write
+        through Rust (Chroma 1.x) have no such component, so bulk-load is skipped there.
+        """
+        try:
+            from chromadb.db.impl.sqlite import SqliteDB
+            sqlite_db = self.client._system._instances.get(SqliteDB)
+        except Exception:
+            sqlite_db = None
+        if sqlite_db is None:
+            logging.warning("--bulk-load requested, but this Chroma backend does not write through Python SQLite; building with default settings.")
+        return sqlite_db
+
+    def _apply_bulk_load_pragmas(self):
+        """
+        Applies `BULK_LOAD_PRAGMAS` to the calling thread's SQLite connection.
+        Relies on Chroma internals, so any failure is logged and the build continues with default settings.
+        """
+        try:
+            conn = self._bulk_load_db._conn_pool.connect()
+            for pragma in BULK_LOAD_PRAGMAS:
+                conn.execute(pragma)
+        except Exception as e:
+            logging.warning(f"Could not apply bulk-load SQLite pragmas, continuing with defaults: {e}")
+
+    def _reset_collection(self) -> chromadb.Collection:
+        """
+        Deletes any existing collection with the configured name and returns a new, empty one.
+        """
         collection_name = self.settings.COLLECTION_NAME
         if collection_name in [c.name for c in self.client.list_collections()]:
             self.client.delete_collection(name=collection_name)
-        
-        collection = self.client.create_collection(name=collection_name)
-        
-        logging.info(f"Embedding {len(chunks)} chunks...")
-        embeddings = self.embedding_model.encode(chunks, show_progress_bar=True, normalize_embeddings=True)
-        collection.add(
-            ids=[f"id_{i}" for i in range(len(chunks))],
-            embeddings=embeddings.tolist(),
-            documents=chunks,
-            metadatas=metadatas
-        )
\ No newline at end of file
+
+        # Embeddings are unit-normalized, so inner product ranks identically to cosine
+        return self.client.create_collection(name=collection_name, metadata={"hnsw:space": "ip"})
+
+    def _iter_encoded_batches(self, chunks, metadatas):
+        """
+        Yields keyword arguments for successive `collection.add` calls, encoding each batch lazily.
+        `encode` already length-sorts within each call; sorting all chunks first also groups similar
+        lengths across pipeline batches, so no batch mixes very short and very long chunks.
+        Ids keep each chunk's original position.
+        """
+        order = np.argsort([len(c) for c in chunks], kind="stable")
+        batch_size = min(PIPELINE_BATCH_SIZE, self._max_add_batch_size())
+        for start in range(0, len(order), batch_size):
+            indices = order[start:start + batch_size]
+            documents = [chunks[i] for i in indices]
+            yield {
+                "ids": [f"id_{i}" for i in indices],
+                "embeddings": self._encode(documents),
+                "documents": documents,
+                "metadatas": [metadatas[i] for i in indices],
+            }
+
+    def _encode(self, documents: list) -> np.ndarray:
+        """
+        Encodes documents into normalized embeddings, in input order.
+        Returns a contiguous float32 matrix.
+        """
+        batch_size = CPU_ENCODE_BATCH_SIZE if self.embedding_model.device.type == "cpu" else GPU_ENCODE_BATCH_SIZE
+        embeddings = self.embedding_model.encode(
+            documents,
+            batch_size=batch_size,
+            show_progress_bar=False,
+            convert_to_numpy=True,
+        )
+        # Chroma accepts ndarrays directly; a contiguous float32 matrix avoids boxing
+        # every component as a Python float on the way into the Rust layer.
+        embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+        # Normalize after the float32 cast so half-precision models still yield unit vectors
+        embeddings /= np.maximum(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12)
+        return embeddings
+
+    def _max_add_batch_size(self) -> int:
+        """
+        Returns the largest number of records the Chroma backend accepts per `add` call.
+        Falls back to a conservative default on client versions without the API.
+        """
+        try:
+            return self.client.get_max_batch_size()
+        except Exception:
+            return DEFAULT_MAX_ADD_BATCH_SIZE
\ No newline at end of file
@@ -5,20 +5,81 @@ Dependency Utilities for FastAPI RAG System
 This module provides reusable dependency functions for the FastAPI application, including rate limiting and client IP extraction.
 
 Key Responsibilities:
-- Enforce per-client rate limiting to protect the API from abuse.
+- Enforce per-client rate limiting to protect the API from abuse, shared across workers via Redis when configured.
 - Provide utility functions for extracting client IP addresses in a proxy-aware manner.
 
 Usage:
 Import and use these dependencies in FastAPI endpoint definitions via the `Depends` mechanism.
 """
 
-from time import time
-from collections import defaultdict
+import logging
+from time import monotonic_ns
+from cachetools import LRUCache
 from fastapi import Request, HTTPException
-from typing import Dict, List
+from typing import MutableMapping, Tuple
 
-# In-memory record of request timestamps per client IP
-rate_limit_records: Dict[str, List[float]] = defaultdict(list)
+# Redis is optional; it is only needed when REDIS_URL is configured
+try:
+    import redis.asyncio as aioredis
+except ImportError:
+    aioredis = None
+
+# Upper bound on tracked clients; the least recently seen IPs are evicted first
+MAX_TRACKED_CLIENTS = 100_000
+
+NANOSECONDS_PER_SECOND = 1_000_000_000
+
+# Redis calls sit on the /ask hot path, so an unreachable server must fail fast
+REDIS_SOCKET_TIMEOUT_SECONDS = 0.25
+# After a Redis failure, skip it (using the in-memory limit) for this long before retrying
+REDIS_RETRY_BACKOFF_SECONDS = 30
+# Monotonic time (ns) before which Redis is not retried; 0 while Redis is healthy
+_redis_retry_at_ns = 0
+
+# In-memory token bucket per client IP: (tokens remaining, monotonic time of last refill in ns)
+rate_limit_records: MutableMapping[str, Tuple[float, int]] = LRUCache(maxsize=MAX_TRACKED_CLIENTS)
+
+# Atomic token bucket evaluated inside Redis, so all workers share one limit per client in a single
+# round trip. Uses the Redis server clock to stay consistent across processes and hosts.
+# KEYS[1]: bucket key; ARGV[1]: capacity; ARGV[2]: refill timeframe in seconds. Returns 1 if allowed.
+REDIS_TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local timeframe = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'last_refill')
+local tokens = tonumber(state[1]) or capacity
+local last_refill = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + (now - last_refill) * capacity / timeframe)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'last_refill', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(timeframe))
+return allowed
+"""
+
+def create_rate_limit_script(redis_url: str):
+    """
+    Creates a Redis client and registers the token-bucket script.
+    The client connects lazily, so callers should `await client.ping()` to verify the server is reachable.
+
+    Args:
+        redis_url (str): Redis connection URL, e.g. `redis://localhost:6379/0`.
+
+    Returns:
+        tuple: (Redis client, AsyncScript to be stored on `app.state.rate_limit_script`)
+    """
+    if aioredis is None:
+        raise RuntimeError("REDIS_URL is set but the 'redis' package is not installed.")
+    client = aioredis.from_url(
+        redis_url,
+        socket_connect_timeout=REDIS_SOCKET_TIMEOUT_SECONDS,
+        socket_timeout=REDIS_SOCKET_TIMEOUT_SECONDS,
+    )
+    return client, client.register_script(REDIS_TOKEN_BUCKET_SCRIPT)
 
 def get_client_ip(request: Request) -> str:
     """
@@ -34,7 +95,11 @@ def get_client_ip(request: Request) -> str:
         str: The client IP address.
     """
     if x_forwarded_for := request.headers.get("x-forwarded-for"):
-        return x_forwarded_for.split(",")[0].strip()
+        # Only the first (client) hop is needed; slice it out without splitting the whole chain
+        first_comma = x_forwarded_for.find(",")
+        if first_comma == -1:
+            return x_forwarded_for.strip()
+        return x_forwarded_for[:first_comma].strip()
     return request.client.host
 
 async def rate_limiter(request: Request):
@@ -42,8 +107,11 @@ async def rate_limiter(request: Request):
     Rate Limiter Dependency
     ----------------------
 
-    Enforces a simple in-memory rate limit per client IP address.
-    Raises HTTP 429 if the client exceeds the allowed request rate.
+    Enforces a token-bucket rate limit per client IP address.
+    Each client may burst up to `RATE_LIMIT_REQUESTS` requests, refilled evenly over
+    `RATE_LIMIT_TIMEFRAME_SECONDS`. Raises HTTP 429 once the bucket is empty.
+    Buckets live in Redis when configured, so the limit holds across all workers;
+    otherwise (or if Redis is unreachable) each worker enforces it in memory.
 
     Args:
         request (Request): The FastAPI request object.
@@ -53,8 +121,52 @@ async def rate_limiter(request: Request):
     """
     client_ip = get_client_ip(request)
     settings = request.app.state.settings
-    now = time()
-    rate_limit_records[client_ip] = [t for t in rate_limit_records[client_ip] if t > now - settings.RATE_LIMIT_TIMEFRAME_SECONDS]
-    if len(rate_limit_records[client_ip]) >= settings.RATE_LIMIT_REQUESTS:
+    script = getattr(request.app.state, "rate_limit_script", None)
+    allowed = None
+    if script is not None:
+        allowed = await _take_token_from_redis(script, client_ip, settings.RATE_LIMIT_REQUESTS, settings.RATE_LIMIT_TIMEFRAME_SECONDS)
+    if allowed is None:
+        allowed = _take_token_in_memory(client_ip, settings.RATE_LIMIT_REQUESTS, settings.RATE_LIMIT_TIMEFRAME_SECONDS)
+    if not allowed:
         raise HTTPException(status_code=429, detail="Too Many Requests")
-    rate_limit_records[client_ip].append(now)
\ No newline at end of file
+
+async def _take_token_from_redis(script, client_ip: str, capacity: int, timeframe_seconds: int):
+    """
+    Takes one token from the client's shared Redis bucket.
+    Returns True/False for allowed/limited, or None if Redis is unavailable. After a failure,
+    Redis is skipped for `REDIS_RETRY_BACKOFF_SECONDS`, so an outage neither stalls every
+    request on timeouts nor logs a warning per request.
+    """
+    global _redis_retry_at_ns
+    if _redis_retry_at_ns and monotonic_ns() < _redis_retry_at_ns:
+        return None
+    try:
+        allowed = bool(await script(keys=[f"rate_limit:{client_ip}"], args=[capacity, timeframe_seconds]))
+    except Exception as e:
+        if not _redis_retry_at_ns:
+            logging.warning(
+                f"Redis rate limiter unavailable, using in-memory limits; retrying every "
+                f"{REDIS_RETRY_BACKOFF_SECONDS}s. Error: {e}"
+            )
+        _redis_retry_at_ns = monotonic_ns() + REDIS_RETRY_BACKOFF_SECONDS * NANOSECONDS_PER_SECOND
+        return None
+    if _redis_retry_at_ns:
+        logging.info("Redis rate limiter reachable again.")
+        _redis_retry_at_ns = 0
+    return allowed
+
+def _take_token_in_memory(client_ip: str, capacity: int, timeframe_seconds: int) -> bool:
+    """
+    Refills the client's in-memory bucket and takes one token if available.
+    Returns True if the request is allowed.
+    """
+    # Monotonic integer nanoseconds: a cheap vDSO read, immune to wall-clock jumps
+    now = monotonic_ns()
+    tokens, last_refill = rate_limit_records.get(client_ip, (capacity, now))
+    timeframe_ns = timeframe_seconds * NANOSECONDS_PER_SECOND
+    tokens = min(capacity, tokens + (now - last_refill) * capacity / timeframe_ns)
+    if tokens < 1:
+        rate_limit_records[client_ip] = (tokens, now)
+        return False
+    rate_limit_records[client_ip] = (tokens - 1, now)
+    return True
\ No newline at end of file
@@ -18,18 +18,19 @@ import logging
 import os
 import torch
 from fastapi import FastAPI, Depends, Request
+from fastapi.exceptions import RequestValidationError
 from fastapi.responses import HTMLResponse, StreamingResponse
 from fastapi.templating import Jinja2Templates
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
 
 # Local Imports
 from app.config import Settings, get_settings
-from app.dependencies import rate_limiter
+from app.dependencies import create_rate_limit_script, rate_limiter
 from app.core import generate_answer_stream
+from app.models import get_embedder
 
 # Import AI/DB libraries for type hinting and setup
 import google.generativeai as genai
-from sentence_transformers import SentenceTransformer
 import chromadb
 
 # Suppress PyTorch and other loggers if needed
@@ -53,8 +54,16 @@ async def startup_event():
     logging.info("Loading application resources...")
     settings = get_settings()
     app.state.settings = settings
-    app.state.embedding_model = SentenceTransformer(settings.EMBEDDING_MODEL_NAME)
+    app.state.embedding_model = get_embedder()
     
+    if settings.REDIS_URL:
+        try:
+            redis_client, app.state.rate_limit_script = create_rate_limit_script(settings.REDIS_URL)
+            await redis_client.ping()  # from_url() connects lazily; fail now rather than on the first request
+        except Exception as e:
+            logging.critical(f"FATAL: Failed to set up Redis rate limiting. Error: {e}")
+            raise SystemExit(1)
+
     genai.configure(api_key=settings.GEMINI_API_KEY)
     app.state.llm = genai.GenerativeModel(settings.GEMINI_MODEL_NAME)
 
@@ -75,6 +84,8 @@ class AskRequest(BaseModel):
     ------------------------------
     Defines the expected structure for user queries submitted to the API.
     """
+    model_config = ConfigDict(frozen=True)
+
     query: str = Field(..., min_length=3, max_length=200, description="User's question.")
 
 # --- API Endpoints ---
@@ -87,13 +98,51 @@ async def home(request: Request):
     """
     return templates.TemplateResponse("index.html", {"request": request})
 
-@app.post("/ask", dependencies=[Depends(rate_limiter)])
-async def ask(ask_request: AskRequest, request: Request) -> StreamingResponse:
+def _is_json_content_type(content_type: str) -> bool:
+    """
+    Mirrors FastAPI's body check: only `application/json` or `application/*+json` are parsed as JSON.
+    Rejecting other types keeps `/ask` out of reach of preflight-free cross-site "simple" requests.
+    """
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    main_type, _, subtype = media_type.partition("/")
+    return main_type == "application" and (subtype == "json" or subtype.endswith("+json"))
+
+# The body is parsed manually, so its schema is declared explicitly for the API docs
+@app.post(
+    "/ask",
+    dependencies=[Depends(rate_limiter)],
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": AskRequest.model_json_schema()}},
+        }
+    },
+)
+async def ask(request: Request) -> StreamingResponse:
     """
     RAG Answer Endpoint
     ------------------
     Accepts a user query, performs retrieval-augmented generation, and streams the response.
+    The raw body is validated by Pydantic in a single JSON-to-model pass.
+    Validation errors keep FastAPI's contract: HTTP 422 with locations under `body`.
     """
+    body = await request.body()
+    # As in FastAPI, a missing content type is treated as JSON
+    content_type = request.headers.get("content-type")
+    if content_type and not _is_json_content_type(content_type):
+        raise RequestValidationError([{
+            "type": "model_attributes_type",
+            "loc": ("body",),
+            "msg": "Input should be a valid dictionary or object to extract fields from",
+            "input": body.decode("utf-8", errors="replace"),
+        }])
+    try:
+        ask_request = AskRequest.model_validate_json(body)
+    except ValidationError as e:
+        raise RequestValidationError([
+            {**error, "loc": ("body", *error["loc"])} for error in e.errors(include_url=False)
+        ])
+
     pipeline_generator = generate_answer_stream(
         query=ask_request.query,
         settings=request.app.state.settings,
@@ -0,0 +1,139 @@
+"""
+Source File Parsing for RAG System
+==================================
+This module contains the pure-Python steps of ingestion: reading Q&A JSON files, deduplicating
+questions within a file, and splitting answers into word chunks ready for embedding.
+
+Key Responsibilities:
+- Stream Q&A items from source JSON files with bounded memory.
+- Derive compact deduplication keys for questions.
+- Chunk answers into retrieval-sized documents.
+
+Usage:
+Call `parse_file()` per source file. The module deliberately avoids importing torch, ChromaDB,
+or the web stack so it stays cheap to load in ingestion worker processes.
+"""
+
+# app/parsing.py
+
+# Prefer orjson's SIMD parser; both libraries accept raw bytes and yield identical dicts
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json
+
+# xxh3 gives fast 64-bit question digests; blake2b is the stdlib fallback
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+    import hashlib
+
+# ijson streams Q&A items one at a time; without it each file is parsed in full
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Document prefixes, concatenated directly instead of formatting an f-string per chunk
+QUESTION_PREFIX = "Question: "
+ANSWER_PREFIX = "\nAnswer: "
+
+def iter_qna_items(file_path: str):
+    """
+    Yields each Q&A item of a source file (`{category: {"questions": [...]}}`).
+    Streams with ijson when available so peak memory is bounded by a single item
+    rather than the whole file. Both paths accept exactly the same layout: anything
+    else raises, so the caller skips the file either way.
+    """
+    with open(file_path, 'rb') as f:
+        if ijson is None:
+            for category_data in _json.loads(f.read()).values():
+                yield from category_data.get('questions', [])
+            return
+        yield from _stream_qna_items(ijson.parse(f))
+
+def _stream_qna_items(events):
+    """
+    Yields the items of each top-level category's `questions` list from ijson parse events.
+    Tracks container depth so only items directly under `<category>.questions` are taken.
+    """
+    depth, field = 0, None  # open containers; current key inside the category object
+    for prefix, event, value in events:
+        if event == 'map_key':
+            if depth == 2:
+                field = value
+            continue
+        if event in ('end_map', 'end_array'):
+            depth -= 1
+            continue
+        if depth == 0 and event != 'start_map':
+            raise ValueError("Top level must be an object of categories.")
+        if depth == 1 and event != 'start_map':
+            raise ValueError(f"Category '{prefix}' must be an object.")
+        if depth == 2 and field == 'questions' and event != 'start_array':
+            raise ValueError(f"'{prefix}' must be a list.")
+        if depth == 3 and field == 'questions':
+            if event != 'start_map':
+                raise ValueError(f"Items of '{prefix[:-len('.item')]}' must be objects.")
+            # Rebuild just this item from its parse events, up to its closing brace
+            builder = ijson.ObjectBuilder()
+            builder.event(event, value)
+            for item_prefix, item_event, item_value in events:
+                if item_prefix == prefix and item_event == 'end_map':
+                    break
+                builder.event(item_event, item_value)
+            yield builder.value
+            continue
+        if event in ('start_map', 'start_array'):
+            depth += 1
+
+def question_key(normalized_question: str) -> int:
+    """
+    Returns a 64-bit digest of an already stripped and lowercased question for deduplication.
+    Storing integers instead of the lowercased text keeps the seen-set small.
+    """
+    data = normalized_question.encode('utf-8')
+    if xxhash is not None:
+        return xxhash.xxh3_64_intdigest(data)
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'little')
+
+def chunk_words(text: str, chunk_size: int) -> list[str]:
+    """
+    Splits text into chunks of at most `chunk_size` whitespace-separated words.
+    The common single-chunk case is joined once without any slicing.
+    """
+    words = text.split()
+    if len(words) <= chunk_size:
+        return [" ".join(words)] if words else []
+    return [" ".join(words[start:start + chunk_size]) for start in range(0, len(words), chunk_size)]
+
+def parse_file(file_path: str, file_name: str, chunk_size: int) -> list[tuple[int, list[str], str]]:
+    """
+    Parse a Single Source File
+    --------------------------
+    Extracts and chunks the Q&A pairs of one file, keeping the first occurrence of each question.
+    Runs without shared state so files can be parsed in parallel worker processes.
+    Args:
+        file_path (str): Path of the JSON file to read.
+        file_name (str): Name used as the source when an item has no URL.
+        chunk_size (int): Maximum number of words per chunk.
+    Returns:
+        list: One (question key, documents, source) record per unique question, in file order.
+    """
+    records, file_questions = [], set()
+    for qna_item in iter_qna_items(file_path):
+        q, a, url = qna_item.get('question'), qna_item.get('answer'), qna_item.get('url')
+        if not (q and a):
+            continue
+        # Strip once and reuse for both the dedup key and the document header
+        q_stripped = q.strip()
+        if not q_stripped:
+            continue
+        key = question_key(q_stripped.lower())
+        if key not in file_questions:
+            file_questions.add(key)
+            header = QUESTION_PREFIX + q_stripped + ANSWER_PREFIX
+            documents = [header + chunk_text for chunk_text in chunk_words(a, chunk_size)]
+            records.append((key, documents, url or file_name))
+    return records